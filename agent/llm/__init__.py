@@ -1,6 +1,7 @@
 """LLM integration modules."""
 
 from .bedrock_client import BedrockClient
+from .embedding_cache import CachingBedrock
 from .exceptions import (
     BedrockError,
     BedrockRateLimitError,
@@ -24,6 +25,7 @@ from .tool_calling import (
 
 __all__ = [
     "BedrockClient",
+    "CachingBedrock",
     "BedrockError",
     "BedrockRateLimitError", 
     "BedrockTimeoutError",
@@ -0,0 +1,111 @@
+"""LRU caching wrapper for Bedrock embedding requests."""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from agent.llm.exceptions import BedrockError
+
+logger = logging.getLogger(__name__)
+
+
+class CachingBedrock:
+    """Bedrock client wrapper that caches embeddings by exact text match.
+    
+    Only ``generate_embeddings`` is cached; every other attribute is
+    delegated to the wrapped client.
+    """
+    
+    def __init__(self, inner: Any, maxsize: int = 4096):
+        """Initialize the caching wrapper.
+        
+        Args:
+            inner: Client providing ``generate_embeddings``
+            maxsize: Maximum number of cached embeddings
+        """
+        self.inner = inner
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+    
+    def __getattr__(self, name: str) -> Any:
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+    
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Hash text so long inputs are not kept alive as cache keys."""
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        use_cache: bool = True,
+        **kwargs
+    ) -> List[List[float]]:
+        """Generate embeddings, requesting only texts not already cached.
+        
+        Args:
+            texts: List of texts to embed
+            use_cache: Whether to serve cached embeddings; when False every text
+                is sent to the wrapped client and the cache is refreshed
+            **kwargs: Additional arguments for the wrapped client
+        
+        Returns:
+            List of embedding vectors, one per input text
+            
+        Raises:
+            BedrockError: If the wrapped client returns a different number of
+                embeddings than texts requested
+        """
+        if not texts:
+            return []
+        
+        keys = [self._cache_key(text) for text in texts]
+        pending: Dict[str, str] = {}
+        cached: Dict[str, List[float]] = {}
+        fresh: Dict[str, List[float]] = {}
+        
+        # Hits are captured before awaiting, since concurrent calls may evict them
+        for text, key in zip(texts, keys):
+            if use_cache and key in self._cache:
+                self._cache.move_to_end(key)
+                cached[key] = self._cache[key]
+                self.hits += 1
+            elif key not in pending:
+                pending[key] = text
+                self.misses += 1
+        
+        if pending:
+            embeddings = await self.inner.generate_embeddings(list(pending.values()), **kwargs)
+            if len(embeddings) != len(pending):
+                raise BedrockError(
+                    f"Expected {len(pending)} embeddings, got {len(embeddings)}"
+                )
+            
+            for key, embedding in zip(pending, embeddings):
+                fresh[key] = embedding
+                # Empty vectors mark a failed embedding; retry them next time
+                if embedding:
+                    self._cache[key] = embedding
+            
+            logger.debug(
+                f"Embedding cache: {len(pending)} misses, {len(texts) - len(pending)} hits"
+            )
+        
+        # Hand out copies so callers cannot mutate cached vectors
+        results = [list(cached.get(key) or fresh.get(key) or []) for key in keys]
+        
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        
+        return results
+    
+    def clear_cache(self):
+        """Drop all cached embeddings."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
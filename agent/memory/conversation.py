@@ -1,6 +1,5 @@
 """Conversation memory management for session-based context."""
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -15,6 +14,7 @@ from agent.memory.models import (
     MemoryType,
     MessageRole,
 )
+from agent.memory.serialization import read_json, write_json
 from agent.security.sandbox import SecuritySandbox
 
 logger = logging.getLogger(__name__)
@@ -66,8 +66,7 @@ class ConversationMemory:
         try:
             sessions_file = self.storage_path / "sessions.json"
             if sessions_file.exists():
-                with open(sessions_file, 'r', encoding='utf-8') as f:
-                    sessions_data = json.load(f)
+                sessions_data = read_json(sessions_file)
                 
                 for session_data in sessions_data:
                     session = ConversationSession.from_dict(session_data)
@@ -89,8 +88,7 @@ class ConversationMemory:
             sessions_file = self.storage_path / "sessions.json"
             sessions_data = [session.to_dict() for session in self.sessions.values()]
             
-            with open(sessions_file, 'w', encoding='utf-8') as f:
-                json.dump(sessions_data, f, indent=2, ensure_ascii=False)
+            write_json(sessions_file, sessions_data)
             
             # Save current session ID
             if self.current_session_id:
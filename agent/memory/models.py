@@ -8,6 +8,8 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 from uuid import uuid4
 
+import numpy as np
+
 
 class MemoryType(Enum):
     """Types of memory entries."""
@@ -80,6 +82,38 @@ class MemoryEntry:
     access_count: int = 0
     last_accessed: Optional[datetime] = None
     embedding: Optional[List[float]] = None
+    search_text: str = field(default="", init=False, repr=False, compare=False)
+    _unit_embedding: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.refresh_search_text()
+    
+    def refresh_search_text(self):
+        """Recompute the search text after content, summary or tags change."""
+        # NUL-separated so a query cannot match across two fields
+        self.search_text = "\0".join([self.content, self.summary, *self.tags]).lower()
+    
+    def matches_query(self, query_lower: str) -> bool:
+        """Check whether a lowercased query is a substring of the content, summary or a tag."""
+        return query_lower in self.search_text
+    
+    def unit_embedding(self) -> Optional[np.ndarray]:
+        """Get the embedding as an L2-normalized float32 vector.
+        
+        The vector is cached until ``embedding`` is reassigned; zero vectors
+        are returned unnormalized.
+        """
+        if not self.embedding:
+            return None
+        
+        if self._unit_embedding is None or self._unit_embedding[0] is not self.embedding:
+            vector = np.asarray(self.embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector = vector / norm
+            self._unit_embedding = (self.embedding, vector)
+        
+        return self._unit_embedding[1]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -118,10 +152,14 @@ class MemoryEntry:
             embedding=data.get("embedding"),
         )
     
-    def mark_accessed(self):
-        """Mark this memory as accessed."""
+    def mark_accessed(self, now: Optional[datetime] = None):
+        """Mark this memory as accessed.
+        
+        Args:
+            now: Access time (defaults to the current UTC time)
+        """
         self.access_count += 1
-        self.last_accessed = datetime.now(timezone.utc)
+        self.last_accessed = now or datetime.now(timezone.utc)
 
 
 @dataclass
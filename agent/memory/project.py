@@ -13,6 +13,7 @@ from agent.memory.models import (
     MemoryType,
     ProjectContext,
 )
+from agent.memory.serialization import read_json, write_json
 from agent.security.sandbox import SecuritySandbox
 from agent.vector.index import VectorIndex
 
@@ -56,6 +57,8 @@ class ProjectMemory:
         self.projects: Dict[str, ProjectContext] = {}
         self.current_project_id: Optional[str] = None
         self.project_memories: Dict[str, List[MemoryEntry]] = {}  # project_id -> memories
+        self._unsaved_projects: Set[str] = set()  # projects with deferred memory writes
+        self._tag_index: Dict[str, Dict[str, List[MemoryEntry]]] = {}  # project_id -> tag -> memories
         
         # Load existing projects
         self._load_projects()
@@ -67,8 +70,7 @@ class ProjectMemory:
         try:
             projects_file = self.storage_path / "projects.json"
             if projects_file.exists():
-                with open(projects_file, 'r', encoding='utf-8') as f:
-                    projects_data = json.load(f)
+                projects_data = read_json(projects_file)
                 
                 for project_data in projects_data:
                     project = ProjectContext.from_dict(project_data)
@@ -93,11 +95,11 @@ class ProjectMemory:
             for project_id in self.projects.keys():
                 memories_file = self.storage_path / f"memories_{project_id}.json"
                 if memories_file.exists():
-                    with open(memories_file, 'r', encoding='utf-8') as f:
-                        memories_data = json.load(f)
+                    memories_data = read_json(memories_file)
                     
                     memories = [MemoryEntry.from_dict(data) for data in memories_data]
                     self.project_memories[project_id] = memories
+                    self.rebuild_tag_index(project_id)
                     
                     logger.debug(f"Loaded {len(memories)} memories for project {project_id}")
                 
@@ -110,8 +112,7 @@ class ProjectMemory:
             projects_file = self.storage_path / "projects.json"
             projects_data = [project.to_dict() for project in self.projects.values()]
             
-            with open(projects_file, 'w', encoding='utf-8') as f:
-                json.dump(projects_data, f, indent=2, ensure_ascii=False)
+            write_json(projects_file, projects_data)
             
             # Save current project ID
             if self.current_project_id:
@@ -129,9 +130,9 @@ class ProjectMemory:
             if project_id in self.project_memories:
                 memories_file = self.storage_path / f"memories_{project_id}.json"
                 memories_data = [memory.to_dict() for memory in self.project_memories[project_id]]
+                self._unsaved_projects.discard(project_id)
                 
-                with open(memories_file, 'w', encoding='utf-8') as f:
-                    json.dump(memories_data, f, indent=2, ensure_ascii=False)
+                write_json(memories_file, memories_data)
                 
                 logger.debug(f"Saved {len(memories_data)} memories for project {project_id}")
                 
@@ -259,7 +260,8 @@ class ProjectMemory:
         summary: str = "",
         tags: Optional[List[str]] = None,
         importance: float = 0.5,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        persist: bool = True
     ) -> MemoryEntry:
         """Add a memory entry to a project.
         
@@ -271,6 +273,7 @@ class ProjectMemory:
             tags: Memory tags
             importance: Importance score (0.0 to 1.0)
             metadata: Additional metadata
+            persist: Whether to save immediately (otherwise call flush())
             
         Returns:
             Created memory entry
@@ -301,9 +304,13 @@ class ProjectMemory:
             self.project_memories[project_id] = []
         
         self.project_memories[project_id].append(memory)
+        self._index_memory_tags(project_id, memory)
         
         # Save to storage
-        self._save_project_memories(project_id)
+        if persist:
+            self._save_project_memories(project_id)
+        else:
+            self._unsaved_projects.add(project_id)
         
         logger.debug(f"Added memory to project {project_id}: {memory_type.value}")
         return memory
@@ -313,6 +320,7 @@ class ProjectMemory:
         content: str,
         memory_type: MemoryType = MemoryType.PROJECT,
         project_id: Optional[str] = None,
+        persist: bool = True,
         **kwargs
     ) -> MemoryEntry:
         """Add a memory entry with generated embedding.
@@ -321,6 +329,7 @@ class ProjectMemory:
             content: Memory content
             memory_type: Type of memory
             project_id: Project ID
+            persist: Whether to save immediately (otherwise call flush())
             **kwargs: Additional arguments for add_memory
             
         Returns:
@@ -335,22 +344,52 @@ class ProjectMemory:
         except Exception as e:
             logger.warning(f"Failed to generate embedding for memory: {e}")
         
-        # Create memory with embedding
+        # Create memory with embedding, saving once it is attached
         memory = self.add_memory(
             content=content,
             memory_type=memory_type,
             project_id=project_id,
+            persist=False,
             **kwargs
         )
         
         memory.embedding = embedding
         
-        # Save updated memory
-        if project_id or self.current_project_id:
-            self._save_project_memories(project_id or self.current_project_id)
+        if persist:
+            self._save_project_memories(memory.project_id)
         
         return memory
     
+    def flush(self, project_id: Optional[str] = None):
+        """Save memories that were added with ``persist=False``.
+        
+        Args:
+            project_id: Project ID (flushes all pending projects if None)
+        """
+        if project_id:
+            pending = [project_id] if project_id in self._unsaved_projects else []
+        else:
+            pending = list(self._unsaved_projects)
+        
+        for pid in pending:
+            self._save_project_memories(pid)
+    
+    def _index_memory_tags(self, project_id: str, memory: MemoryEntry):
+        """Add a memory to the project's tag index."""
+        project_index = self._tag_index.setdefault(project_id, {})
+        for tag in set(memory.tags):
+            project_index.setdefault(tag, []).append(memory)
+    
+    def rebuild_tag_index(self, project_id: str):
+        """Rebuild the tag index after a project's memory list is replaced.
+        
+        Args:
+            project_id: Project ID whose memories changed
+        """
+        self._tag_index[project_id] = {}
+        for memory in self.project_memories.get(project_id, []):
+            self._index_memory_tags(project_id, memory)
+    
     def search_memories(
         self,
         query: str,
@@ -390,7 +429,16 @@ class ProjectMemory:
         query_lower = query.lower()
         
         for pid in projects_to_search:
-            memories = self.project_memories[pid]
+            if tags:
+                # Narrow to memories carrying any of the tags via the index
+                project_index = self._tag_index.get(pid, {})
+                tagged = {}
+                for tag in tags:
+                    for memory in project_index.get(tag, []):
+                        tagged[memory.id] = memory
+                memories = list(tagged.values())
+            else:
+                memories = self.project_memories[pid]
             
             for memory in memories:
                 # Apply filters
@@ -400,15 +448,8 @@ class ProjectMemory:
                 if memory.importance < min_importance:
                     continue
                 
-                if tags and not any(tag in memory.tags for tag in tags):
-                    continue
-                
-                # Simple text search (could be enhanced with embeddings)
-                content_match = query_lower in memory.content.lower()
-                summary_match = query_lower in memory.summary.lower()
-                tag_match = any(query_lower in tag.lower() for tag in memory.tags)
-                
-                if content_match or summary_match or tag_match:
+                # Substring search over the precomputed lowercase text
+                if memory.matches_query(query_lower):
                     memory.mark_accessed()
                     results.append(memory)
         
@@ -654,6 +695,8 @@ class ProjectMemory:
             # Delete memories
             if project_id in self.project_memories:
                 del self.project_memories[project_id]
+            self._tag_index.pop(project_id, None)
+            self._unsaved_projects.discard(project_id)
             
             # Clear current project if it was deleted
             if self.current_project_id == project_id:
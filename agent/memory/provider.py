@@ -6,8 +6,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
+
 from agent.config import get_settings
 from agent.llm.bedrock_client import BedrockClient
+from agent.llm.embedding_cache import CachingBedrock
 from agent.memory.conversation import ConversationMemory
 from agent.memory.models import (
     ConversationMessage,
@@ -52,7 +55,9 @@ class MemoryProvider:
         self.storage_path = storage_path or Path(settings.memory_db_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
-        self.bedrock = bedrock_client or BedrockClient()
+        # Share one embedding cache between conversation and project memory
+        bedrock = bedrock_client or BedrockClient()
+        self.bedrock = bedrock if isinstance(bedrock, CachingBedrock) else CachingBedrock(bedrock)
         self.vector_index = vector_index
         self.workspace_root = workspace_root or settings.workspace_root
         
@@ -209,7 +214,8 @@ class MemoryProvider:
         tags: Optional[List[str]] = None,
         importance: float = 0.5,
         metadata: Optional[Dict[str, Any]] = None,
-        generate_embedding: bool = True
+        generate_embedding: bool = True,
+        persist: bool = True
     ) -> MemoryEntry:
         """Add a memory entry to a project.
         
@@ -222,6 +228,7 @@ class MemoryProvider:
             importance: Importance score (0.0 to 1.0)
             metadata: Additional metadata
             generate_embedding: Whether to generate embedding
+            persist: Whether to save immediately (otherwise call flush())
             
         Returns:
             Created memory entry
@@ -234,7 +241,8 @@ class MemoryProvider:
                 summary=summary,
                 tags=tags,
                 importance=importance,
-                metadata=metadata
+                metadata=metadata,
+                persist=persist
             )
         else:
             return self.project_memory.add_memory(
@@ -244,9 +252,18 @@ class MemoryProvider:
                 summary=summary,
                 tags=tags,
                 importance=importance,
-                metadata=metadata
+                metadata=metadata,
+                persist=persist
             )
     
+    def flush(self, project_id: Optional[str] = None):
+        """Save project memories that were added with ``persist=False``.
+        
+        Args:
+            project_id: Project ID (flushes all pending projects if None)
+        """
+        self.project_memory.flush(project_id)
+    
     # Unified Search Methods
     
     async def search_memories(
@@ -366,54 +383,54 @@ class MemoryProvider:
                 for memories in self.project_memory.project_memories.values():
                     project_memories.extend(memories)
             
+            # Only memories whose embedding matches the query dimension are comparable
+            candidates = [
+                memory for memory in project_memories
+                if memory.embedding and len(memory.embedding) == len(query_embedding)
+            ]
+            if not candidates:
+                return []
+            
+            # Score all candidates in one matrix-vector product
+            similarities = self._calculate_cosine_similarities(
+                query_embedding,
+                np.stack([memory.unit_embedding() for memory in candidates])
+            )
+            
             results = []
             
-            for memory in project_memories:
-                if not memory.embedding:
-                    continue
-                
-                # Calculate cosine similarity
-                similarity = self._calculate_cosine_similarity(
-                    query_embedding,
-                    memory.embedding
-                )
+            # Walk candidates by descending similarity score
+            for index in np.argsort(-similarities, kind="stable"):
+                similarity = float(similarities[index])
+                if similarity < similarity_threshold or len(results) >= max_results:
+                    break
                 
-                if similarity >= similarity_threshold:
-                    results.append(MemorySearchResult(
-                        entry=memory,
-                        score=similarity,
-                        relevance_reason=f"Semantic similarity: {similarity:.3f}"
-                    ))
-            
-            # Sort by similarity score
-            results.sort(key=lambda r: r.score, reverse=True)
+                results.append(MemorySearchResult(
+                    entry=candidates[index],
+                    score=similarity,
+                    relevance_reason=f"Semantic similarity: {similarity:.3f}"
+                ))
             
-            return results[:max_results]
+            return results
             
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
             return []
     
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        try:
-            import math
-            
-            # Calculate dot product
-            dot_product = sum(a * b for a, b in zip(vec1, vec2))
-            
-            # Calculate magnitudes
-            magnitude1 = math.sqrt(sum(a * a for a in vec1))
-            magnitude2 = math.sqrt(sum(a * a for a in vec2))
-            
-            # Calculate cosine similarity
-            if magnitude1 == 0 or magnitude2 == 0:
-                return 0.0
-            
-            return dot_product / (magnitude1 * magnitude2)
-            
-        except Exception:
-            return 0.0
+    def _calculate_cosine_similarities(
+        self,
+        query: List[float],
+        unit_vectors: np.ndarray
+    ) -> np.ndarray:
+        """Calculate cosine similarity between a query and pre-normalized rows."""
+        query_vector = np.asarray(query, dtype=np.float32)
+        
+        # Zero-magnitude vectors get a similarity of 0.0
+        norm = np.linalg.norm(query_vector)
+        if not norm:
+            return np.zeros(len(unit_vectors), dtype=np.float32)
+        
+        return unit_vectors @ (query_vector / norm)
     
     # Context Management Methods
     
@@ -501,6 +518,7 @@ class MemoryProvider:
             
             # Save project memories
             if memories:
+                self.project_memory.rebuild_tag_index(session.project_id)
                 self.project_memory._save_project_memories(session.project_id)
         
         return memories
@@ -550,6 +568,7 @@ class MemoryProvider:
             # Update memory storage
             removed_count = len(memories) - len(optimized_memories)
             self.project_memory.project_memories[pid] = optimized_memories
+            self.project_memory.rebuild_tag_index(pid)
             
             # Save optimized memories
             self.project_memory._save_project_memories(pid)
@@ -595,7 +614,10 @@ class MemoryProvider:
                 contents = [memory.content for memory in batch]
                 
                 try:
-                    embeddings = await self.bedrock.generate_embeddings(contents)
+                    # Forced regeneration must reach the backend, not the cache
+                    embeddings = await self.bedrock.generate_embeddings(
+                        contents, use_cache=not force_regenerate
+                    )
                     
                     for memory, embedding in zip(batch, embeddings):
                         memory.embedding = embedding
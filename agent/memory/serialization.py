@@ -0,0 +1,69 @@
+"""JSON file helpers for memory persistence."""
+
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+# Optional orjson import
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def read_json(path: Path) -> Any:
+    """Load JSON data from a file.
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        Parsed JSON data
+    """
+    if ORJSON_AVAILABLE:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json writes NaN/Infinity for non-finite floats, which orjson rejects
+            return json.loads(raw)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Check whether data contains NaN or infinite floats."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def write_json(path: Path, data: Any):
+    """Write JSON data to a file as indented UTF-8.
+    
+    Args:
+        path: File to write
+        data: JSON-serializable data
+    """
+    # orjson writes non-finite floats as null; json keeps them as NaN/Infinity
+    if ORJSON_AVAILABLE and not _has_non_finite(data):
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Data orjson rejects but json accepts, e.g. integers wider than 64 bits
+            payload = None
+        
+        if payload is not None:
+            path.write_bytes(payload)
+            return
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
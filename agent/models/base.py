@@ -7,6 +7,11 @@ from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, validator
 
 
+def _now() -> datetime:
+    """Current UTC time; looked up at call time so tests can freeze it."""
+    return datetime.utcnow()
+
+
 class BaseZorixModel(BaseModel):
     """Base model for all Zorix Agent data structures."""
     
@@ -72,7 +77,7 @@ class Message(BaseZorixModel):
     """A message in the conversation."""
     role: MessageRole
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: _now())
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
     @validator('content')
@@ -168,7 +173,7 @@ class ErrorResponse(BaseZorixModel):
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
     suggestion: Optional[str] = Field(None, description="Suggested resolution")
     retry_after: Optional[int] = Field(None, description="Seconds to wait before retry")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: _now())
 
 
 class HealthStatus(BaseZorixModel):
@@ -176,7 +181,7 @@ class HealthStatus(BaseZorixModel):
     status: str = Field(..., description="Overall health status")
     service: str = Field(..., description="Service name")
     version: str = Field(..., description="Service version")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: _now())
     checks: Dict[str, Any] = Field(default_factory=dict, description="Individual health checks")
     workspace: Optional[str] = Field(None, description="Workspace path")
     bedrock_region: Optional[str] = Field(None, description="AWS Bedrock region")
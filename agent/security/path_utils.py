@@ -1,12 +1,45 @@
 """Path utilities with security validation."""
 
+import fnmatch
 import os
+import re
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Pattern, Tuple, Union
 
 from agent.security.exceptions import SecurityError
 from agent.security.sandbox import SecuritySandbox
 
+# Extension lookups shared by is_text_file/is_code_file
+_TEXT_EXTENSIONS = frozenset({
+    ".txt", ".md", ".rst", ".py", ".js", ".ts", ".jsx", ".tsx",
+    ".html", ".htm", ".css", ".scss", ".sass", ".less",
+    ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg",
+    ".xml", ".svg", ".csv", ".log",
+    ".sh", ".bash", ".zsh", ".fish", ".ps1", ".bat", ".cmd",
+    ".c", ".cpp", ".cc", ".cxx", ".h", ".hpp",
+    ".java", ".kt", ".scala", ".clj", ".cljs",
+    ".go", ".rs", ".rb", ".php", ".pl", ".r",
+    ".sql", ".dockerfile", ".makefile",
+    ".gitignore", ".gitattributes", ".editorconfig",
+})
+
+# Extension-less file names (lowercased) that are text
+_TEXT_FILENAMES = frozenset({"makefile", "dockerfile", "readme", "license", "changelog"})
+
+_CODE_EXTENSIONS = frozenset({
+    ".py", ".js", ".ts", ".jsx", ".tsx",
+    ".java", ".kt", ".scala", ".clj", ".cljs",
+    ".c", ".cpp", ".cc", ".cxx", ".h", ".hpp",
+    ".go", ".rs", ".rb", ".php", ".pl", ".r",
+    ".sh", ".bash", ".zsh", ".fish", ".ps1",
+    ".html", ".htm", ".css", ".scss", ".sass", ".less",
+    ".sql", ".dockerfile",
+})
+
+# Runs of characters not allowed in generated filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
 
 class SecurePath:
     """A path wrapper that enforces security constraints."""
@@ -20,6 +53,7 @@ class SecurePath:
         """
         self.sandbox = sandbox
         self._path = sandbox.validate_path(str(path))
+        self._relative: Optional[Path] = None
     
     @property
     def path(self) -> Path:
@@ -84,7 +118,10 @@ class SecurePath:
     
     def relative_to_workspace(self) -> Path:
         """Get path relative to workspace root."""
-        return self._path.relative_to(self.sandbox.workspace_root)
+        # Both paths are fixed once validated, so compute the relative path once
+        if self._relative is None:
+            self._relative = self._path.relative_to(self.sandbox.workspace_root)
+        return self._relative
 
 
 def normalize_path_separators(path: str) -> str:
@@ -96,6 +133,8 @@ def normalize_path_separators(path: str) -> str:
     Returns:
         Normalized path string
     """
+    if "\\" not in path:
+        return path
     return path.replace("\\", "/")
 
 
@@ -132,7 +171,16 @@ def get_file_extension(path: Path) -> str:
     Returns:
         File extension (including dot) in lowercase
     """
-    return path.suffix.lower()
+    return _name_extension(path.name)
+
+
+def _name_extension(name: str) -> str:
+    """Get the lowercased extension of a bare file name."""
+    # Same rules as PurePath.suffix: no suffix for dotfiles or a trailing dot
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ""
 
 
 def is_text_file(path: Path) -> bool:
@@ -144,23 +192,7 @@ def is_text_file(path: Path) -> bool:
     Returns:
         True if likely a text file
     """
-    text_extensions = {
-        ".txt", ".md", ".rst", ".py", ".js", ".ts", ".jsx", ".tsx",
-        ".html", ".htm", ".css", ".scss", ".sass", ".less",
-        ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg",
-        ".xml", ".svg", ".csv", ".log",
-        ".sh", ".bash", ".zsh", ".fish", ".ps1", ".bat", ".cmd",
-        ".c", ".cpp", ".cc", ".cxx", ".h", ".hpp",
-        ".java", ".kt", ".scala", ".clj", ".cljs",
-        ".go", ".rs", ".rb", ".php", ".pl", ".r",
-        ".sql", ".dockerfile", ".makefile",
-        ".gitignore", ".gitattributes", ".editorconfig",
-    }
-    
-    extension = get_file_extension(path)
-    return extension in text_extensions or path.name.lower() in {
-        "makefile", "dockerfile", "readme", "license", "changelog"
-    }
+    return get_file_extension(path) in _TEXT_EXTENSIONS or path.name.lower() in _TEXT_FILENAMES
 
 
 def is_code_file(path: Path) -> bool:
@@ -172,18 +204,32 @@ def is_code_file(path: Path) -> bool:
     Returns:
         True if it's a code file
     """
-    code_extensions = {
-        ".py", ".js", ".ts", ".jsx", ".tsx",
-        ".java", ".kt", ".scala", ".clj", ".cljs",
-        ".c", ".cpp", ".cc", ".cxx", ".h", ".hpp",
-        ".go", ".rs", ".rb", ".php", ".pl", ".r",
-        ".sh", ".bash", ".zsh", ".fish", ".ps1",
-        ".html", ".htm", ".css", ".scss", ".sass", ".less",
-        ".sql", ".dockerfile",
-    }
+    return get_file_extension(path) in _CODE_EXTENSIONS
+
+
+def classify_paths(paths: List[str]) -> Tuple[List[str], List[str]]:
+    """Split path strings into text files and code files in one pass.
     
-    extension = get_file_extension(path)
-    return extension in code_extensions
+    Equivalent to calling is_text_file and is_code_file on each path, without
+    building a Path per entry. A path can appear in both lists.
+    
+    Args:
+        paths: Path strings to classify
+        
+    Returns:
+        Tuple of (text file paths, code file paths), in input order
+    """
+    text_files = []
+    code_files = []
+    for path in paths:
+        name = os.path.basename(path)
+        extension = _name_extension(name)
+        if extension in _TEXT_EXTENSIONS or name.lower() in _TEXT_FILENAMES:
+            text_files.append(path)
+        if extension in _CODE_EXTENSIONS:
+            code_files.append(path)
+    
+    return text_files, code_files
 
 
 def get_safe_filename(filename: str) -> str:
@@ -195,16 +241,8 @@ def get_safe_filename(filename: str) -> str:
     Returns:
         Safe filename
     """
-    # Remove or replace dangerous characters
-    safe_chars = []
-    for char in filename:
-        if char.isalnum() or char in ".-_":
-            safe_chars.append(char)
-        elif char in " /\\:":
-            safe_chars.append("_")
-        # Skip other dangerous characters like <>|?*
-    
-    safe_name = "".join(safe_chars)
+    # Collapse each run of dangerous characters into a single underscore
+    safe_name = _UNSAFE_FILENAME_CHARS.sub("_", filename)
     
     # Ensure it's not empty and doesn't start with dot
     if not safe_name or safe_name.startswith("."):
@@ -213,6 +251,84 @@ def get_safe_filename(filename: str) -> str:
     return safe_name
 
 
+def _compile_glob(pattern: str) -> Optional[List[Optional[Pattern]]]:
+    """Compile a glob into one matcher per path segment.
+    
+    Args:
+        pattern: Glob pattern relative to the search root
+        
+    Returns:
+        Matchers per segment (None matches any name), or None when the
+        pattern needs pathlib's full glob semantics (``**`` or ``..``)
+    """
+    segments = [
+        segment for segment in normalize_path_separators(pattern).split("/")
+        if segment not in ("", ".")
+    ]
+    if not segments or any("**" in segment or segment == ".." for segment in segments):
+        return None
+    
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return [
+        None if segment == "*" else re.compile(fnmatch.translate(segment), flags)
+        for segment in segments
+    ]
+
+
+def _segment_matches(matcher: Optional[Pattern], name: str) -> bool:
+    """Check a single path segment against a compiled matcher."""
+    return matcher is None or matcher.match(name) is not None
+
+
+def _list_dir(directory: str) -> List[os.DirEntry]:
+    """List directory entries, treating unreadable directories as empty."""
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _match_nested(directory: str, matchers: List[Optional[Pattern]]) -> Iterator[str]:
+    """Yield files below directory matching a multi-segment glob."""
+    matcher, rest = matchers[0], matchers[1:]
+    for entry in _list_dir(directory):
+        if not _segment_matches(matcher, entry.name):
+            continue
+        if not rest:
+            if entry.is_file():
+                yield entry.path
+        elif entry.is_dir():
+            yield from _match_nested(entry.path, rest)
+
+
+def _iter_glob_files(
+    root: str,
+    matchers: List[Optional[Pattern]],
+    recursive: bool
+) -> Iterator[str]:
+    """Yield files matching compiled glob segments with a single scandir per directory.
+    
+    Recursive searches anchor the glob at every directory below root, like
+    ``Path.rglob``, without descending into symlinked directories.
+    """
+    pending = deque([root])
+    single_segment = len(matchers) == 1
+    
+    while pending:
+        directory = pending.popleft()
+        entries = _list_dir(directory)
+        
+        for entry in entries:
+            if single_segment and _segment_matches(matchers[0], entry.name) and entry.is_file():
+                yield entry.path
+            if recursive and entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+        
+        if not single_segment:
+            yield from _match_nested(directory, matchers)
+
+
 def find_files_by_pattern(
     root_path: SecurePath,
     pattern: str,
@@ -234,7 +350,13 @@ def find_files_by_pattern(
         return []
     
     try:
-        if recursive:
+        matchers = _compile_glob(pattern)
+        if matchers is not None:
+            matches = (
+                Path(match)
+                for match in _iter_glob_files(str(root_path.path), matchers, recursive)
+            )
+        elif recursive:
             matches = root_path.path.rglob(pattern)
         else:
             matches = root_path.path.glob(pattern)
@@ -272,16 +394,16 @@ def calculate_directory_size(path: SecurePath) -> int:
         return 0
     
     total_size = 0
-    try:
-        for item in path.path.rglob("*"):
-            if item.is_file():
-                try:
-                    total_size += item.stat().st_size
-                except OSError:
-                    # Skip files we can't stat
-                    continue
-    except Exception:
-        # Return partial size on error
-        pass
-    
-    return total_size
\ No newline at end of file
+    pending = [str(path.path)]
+    while pending:
+        for entry in _list_dir(pending.pop()):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    total_size += entry.stat().st_size
+            except OSError:
+                # Skip entries we can't stat
+                continue
+    
+    return total_size
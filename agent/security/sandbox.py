@@ -20,12 +20,17 @@ class SecuritySandbox:
             denylist: List of path patterns to deny access to
         """
         self.workspace_root = workspace_root.resolve()
+        
+        # String prefix for containment checks in validate_path
+        self._root_str = os.path.normcase(str(self.workspace_root))
+        self._root_prefix = self._root_str.rstrip(os.sep) + os.sep
         self.denylist_patterns = denylist or self._get_default_denylist()
         
         # Compile regex patterns for efficiency
         self._compiled_patterns = [
             re.compile(pattern, re.IGNORECASE) for pattern in self.denylist_patterns
         ]
+        self._combined_pattern = self._combine_patterns(self.denylist_patterns)
         
         # Ensure workspace root exists
         if not self.workspace_root.exists():
@@ -62,6 +67,29 @@ class SecuritySandbox:
             r".*\.db-shm$",
         ]
     
+    @staticmethod
+    def _combine_patterns(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+        """Combine denylist patterns into a single alternation regex.
+        
+        Args:
+            patterns: Denylist regex patterns
+            
+        Returns:
+            Compiled alternation, or None if the patterns cannot be safely combined
+            (numbered or named backreferences, inline flags, or no patterns at all)
+        """
+        if not patterns or any(
+            re.search(r"\\[1-9]|\(\?P=|\(\?[aiLmsux]", pattern) for pattern in patterns
+        ):
+            return None
+        
+        try:
+            return re.compile(
+                "|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE
+            )
+        except re.error:
+            return None
+    
     def validate_path(self, path: str) -> Path:
         """Validate and normalize a path for safe access.
         
@@ -93,16 +121,22 @@ class SecuritySandbox:
         except Exception as e:
             raise SecurityError(f"Cannot resolve path {path}: {e}") from e
         
-        # Ensure path is within workspace boundaries
-        try:
-            resolved_path.relative_to(self.workspace_root)
-        except ValueError:
+        # Ensure path is within workspace boundaries, using the relative path
+        # within the workspace for the denylist checks below
+        resolved_str = str(resolved_path)
+        normalized = os.path.normcase(resolved_str)
+        if normalized.startswith(self._root_prefix):
+            relative_path = resolved_str[len(self._root_prefix):]
+        elif normalized == self._root_str:
+            relative_path = "."
+        else:
             raise SecurityError(
                 f"Path outside workspace: {resolved_path} not within {self.workspace_root}"
             )
         
-        # Check against denylist patterns using relative path within workspace
-        relative_path = str(resolved_path.relative_to(self.workspace_root))
+        # Single pass over the path for the common case of no match
+        if self._combined_pattern is not None and not self._combined_pattern.search(relative_path):
+            return resolved_path
         
         for i, pattern in enumerate(self._compiled_patterns):
             if pattern.search(relative_path):
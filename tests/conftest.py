@@ -0,0 +1,13 @@
+"""Shared pytest fixtures."""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across the async tests."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -1,14 +1,16 @@
 """Tests for the memory system components."""
 
 import asyncio
+import itertools
 import json
-import tempfile
+import math
+import os
 from datetime import datetime, timezone
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from agent.llm.embedding_cache import CachingBedrock
+from agent.llm.exceptions import BedrockError
 from agent.memory.conversation import ConversationMemory
 from agent.memory.models import (
     ConversationMessage,
@@ -21,22 +23,77 @@ from agent.memory.models import (
 from agent.memory.project import ProjectMemory
 from agent.memory.provider import MemoryProvider
 
+# Enum members bound once for the many message/memory constructions below
+_USER = MessageRole.USER
+_ASSISTANT = MessageRole.ASSISTANT
+_CONVERSATION = MemoryType.CONVERSATION
+_PROJECT = MemoryType.PROJECT
+_CODE_CTX = MemoryType.CODE_CONTEXT
 
-class TestConversationMemory:
-    """Test conversation memory functionality."""
+
+class _StubBedrock:
+    """Lightweight Bedrock stand-in that returns fixed embeddings."""
     
-    @pytest.fixture
-    def temp_storage(self):
-        """Create temporary storage directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
     
-    @pytest.fixture
-    def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_embeddings = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
-        return mock
+    async def generate_embeddings(self, texts):
+        # One embedding per text, cycling through the configured vectors
+        return [list(embedding) for embedding, _ in zip(itertools.cycle(self.embeddings), texts)]
+
+
+@pytest.fixture(scope="session")
+def mock_bedrock():
+    """Stub Bedrock client shared across the memory tests."""
+    return _StubBedrock([[0.1, 0.2, 0.3]])
+
+
+@pytest.fixture
+def temp_storage(tmp_path_factory):
+    """Create a per-test storage directory under the session temp root."""
+    return tmp_path_factory.mktemp("storage")
+
+
+SAMPLE_WORKSPACE_FILES = {
+    "README.md": b"# Test Project\nThis is a test project.",
+    "requirements.txt": b"fastapi==0.68.0\nuvicorn==0.15.0",
+    "src/main.py": b"def main():\n    print('Hello, world!')",
+}
+
+
+def _dump(root, files):
+    """Write raw file contents under root with one low-level write per file."""
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+@pytest.fixture(scope="session")
+def workspace_template(tmp_path_factory):
+    """Build the sample workspace tree once per session."""
+    workspace = tmp_path_factory.mktemp("ws_tpl")
+    _dump(workspace, SAMPLE_WORKSPACE_FILES)
+    return workspace
+
+
+@pytest.fixture
+def temp_workspace(workspace_template):
+    """Provide the shared sample workspace.
+    
+    The memory components only read the workspace, so tests share the
+    template directly. A test that needs to modify the tree should copy it
+    into its own directory with ``shutil.copytree`` first.
+    """
+    return workspace_template
+
+
+class TestConversationMemory:
+    """Test conversation memory functionality."""
     
     @pytest.fixture
     def conversation_memory(self, temp_storage, mock_bedrock):
@@ -66,12 +123,12 @@ class TestConversationMemory:
         
         message = conversation_memory.add_message(
             content="Hello, world!",
-            role=MessageRole.USER,
+            role=_USER,
             metadata={"test": "metadata"}
         )
         
         assert message.content == "Hello, world!"
-        assert message.role == MessageRole.USER
+        assert message.role == _USER
         assert message.metadata["test"] == "metadata"
         assert len(session.messages) == 1
         assert session.messages[0] == message
@@ -84,7 +141,7 @@ class TestConversationMemory:
         for i in range(5):
             conversation_memory.add_message(
                 content=f"Message {i}",
-                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+                role=_USER if i % 2 == 0 else _ASSISTANT
             )
         
         context = conversation_memory.get_conversation_context(max_messages=3)
@@ -96,49 +153,27 @@ class TestConversationMemory:
         session = conversation_memory.create_session("Test Session")
         
         # Add messages with searchable content
-        conversation_memory.add_message("How do I implement authentication?", MessageRole.USER)
-        conversation_memory.add_message("You can use JWT tokens for authentication.", MessageRole.ASSISTANT)
-        conversation_memory.add_message("What about database connections?", MessageRole.USER)
+        conversation_memory.add_message("How do I implement authentication?", _USER)
+        conversation_memory.add_message("You can use JWT tokens for authentication.", _ASSISTANT)
+        conversation_memory.add_message("What about database connections?", _USER)
         
         results = conversation_memory.search_conversations("authentication")
         assert len(results) == 2  # User question and assistant answer
         assert "authentication" in results[0]["message"]["content"].lower()
     
-    def test_session_persistence(self, temp_storage, mock_bedrock):
-        """Test session persistence across instances."""
-        # Create first instance and add data
-        memory1 = ConversationMemory(
-            storage_path=temp_storage / "conversations",
-            bedrock_client=mock_bedrock
-        )
-        
-        session = memory1.create_session("Persistent Session")
-        memory1.add_message("Test message", MessageRole.USER)
-        
-        # Create second instance and verify data is loaded
-        memory2 = ConversationMemory(
-            storage_path=temp_storage / "conversations",
-            bedrock_client=mock_bedrock
-        )
-        
-        assert session.id in memory2.sessions
-        assert len(memory2.sessions[session.id].messages) == 1
-        assert memory2.sessions[session.id].messages[0].content == "Test message"
-    
-    @pytest.mark.asyncio
     async def test_create_memory_entries(self, conversation_memory):
         """Test creating memory entries from conversation."""
         session = conversation_memory.create_session("Test Session")
         
         # Add conversation with code discussion
-        conversation_memory.add_message("How do I implement a REST API?", MessageRole.USER)
-        conversation_memory.add_message("You can use FastAPI with these steps...", MessageRole.ASSISTANT)
-        conversation_memory.add_message("```python\nfrom fastapi import FastAPI\n```", MessageRole.ASSISTANT)
+        conversation_memory.add_message("How do I implement a REST API?", _USER)
+        conversation_memory.add_message("You can use FastAPI with these steps...", _ASSISTANT)
+        conversation_memory.add_message("```python\nfrom fastapi import FastAPI\n```", _ASSISTANT)
         
         memories = await conversation_memory.create_memory_entries(session.id, importance_threshold=0.1)
         
         assert len(memories) >= 0  # May be 0 if importance is too low
-        assert memories[0].memory_type == MemoryType.CONVERSATION
+        assert memories[0].memory_type == _CONVERSATION
         assert memories[0].session_id == session.id
         assert "REST API" in memories[0].content or "FastAPI" in memories[0].content
 
@@ -146,33 +181,6 @@ class TestConversationMemory:
 class TestProjectMemory:
     """Test project memory functionality."""
     
-    @pytest.fixture
-    def temp_storage(self):
-        """Create temporary storage directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            workspace = Path(temp_dir)
-            
-            # Create sample files
-            (workspace / "README.md").write_text("# Test Project\nThis is a test project.")
-            (workspace / "requirements.txt").write_text("fastapi==0.68.0\nuvicorn==0.15.0")
-            (workspace / "src").mkdir()
-            (workspace / "src" / "main.py").write_text("def main():\n    print('Hello, world!')")
-            
-            yield workspace
-    
-    @pytest.fixture
-    def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_embeddings = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
-        return mock
-    
     @pytest.fixture
     def project_memory(self, temp_storage, temp_workspace, mock_bedrock):
         """Create project memory instance."""
@@ -212,28 +220,27 @@ class TestProjectMemory:
         
         memory = project_memory.add_memory(
             content="This is important project knowledge",
-            memory_type=MemoryType.PROJECT,
+            memory_type=_PROJECT,
             summary="Important knowledge",
             tags=["important", "knowledge"],
             importance=0.8
         )
         
         assert memory.content == "This is important project knowledge"
-        assert memory.memory_type == MemoryType.PROJECT
+        assert memory.memory_type == _PROJECT
         assert memory.project_id == project.id
         assert memory.importance == 0.8
         assert "important" in memory.tags
         assert project.id in project_memory.project_memories
         assert memory in project_memory.project_memories[project.id]
     
-    @pytest.mark.asyncio
     async def test_add_memory_with_embedding(self, project_memory):
         """Test adding memory with embedding generation."""
         project = project_memory.create_project("Test Project")
         
         memory = await project_memory.add_memory_with_embedding(
             content="This memory will have an embedding",
-            memory_type=MemoryType.CODE_CONTEXT
+            memory_type=_CODE_CTX
         )
         
         assert memory.embedding is not None
@@ -253,68 +260,149 @@ class TestProjectMemory:
         results = project_memory.search_memories("authentication")
         assert len(results) == 2
         
+        # Partial words and phrases match as case-insensitive substrings
+        results = project_memory.search_memories("auth")
+        assert len(results) == 2
+        
+        results = project_memory.search_memories("jwt")
+        assert len(results) == 1
+        assert "JWT" in results[0].content
+        
+        results = project_memory.search_memories("DATABASE CONNECT")
+        assert len(results) == 1
+        
+        # Words in a different order are not a substring match
+        assert project_memory.search_memories("JWT authentication") == []
+        
         # Search by tags
         results = project_memory.search_memories("database", tags=["database"])
         assert len(results) == 1
         assert "Database connection" in results[0].content
-    
-    def test_project_persistence(self, temp_storage, temp_workspace, mock_bedrock):
-        """Test project persistence across instances."""
-        # Create first instance and add data
-        memory1 = ProjectMemory(
-            storage_path=temp_storage / "projects",
-            bedrock_client=mock_bedrock,
-            workspace_root=str(temp_workspace)
-        )
         
-        project = memory1.create_project("Persistent Project")
-        memory1.add_memory("Persistent memory", project_id=project.id)
+        # Tag filters match memories carrying any of the given tags
+        results = project_memory.search_memories("authentication", tags=["api", "database"])
+        assert len(results) == 1
+        assert "JWT" in results[0].content
         
-        # Create second instance and verify data is loaded
-        memory2 = ProjectMemory(
-            storage_path=temp_storage / "projects",
-            bedrock_client=mock_bedrock,
-            workspace_root=str(temp_workspace)
-        )
+        # Punctuation in the query is matched literally, not dropped
+        project_memory.add_memory("Bindings written in C for speed")
+        assert project_memory.search_memories("c++") == []
+
+
+def _conversation_memory(storage, bedrock, workspace):
+    return ConversationMemory(
+        storage_path=storage / "conversations",
+        bedrock_client=bedrock
+    )
+
+
+def _project_memory(storage, bedrock, workspace):
+    return ProjectMemory(
+        storage_path=storage / "projects",
+        bedrock_client=bedrock,
+        workspace_root=str(workspace)
+    )
+
+
+def _write_session(memory):
+    session = memory.create_session("Persistent Session")
+    memory.add_message("Test message", _USER)
+    return session.id
+
+
+def _verify_session(memory, session_id):
+    assert session_id in memory.sessions
+    assert len(memory.sessions[session_id].messages) == 1
+    assert memory.sessions[session_id].messages[0].content == "Test message"
+
+
+def _write_project(memory):
+    project = memory.create_project("Persistent Project")
+    memory.add_memory("Persistent memory", project_id=project.id)
+    return project.id
+
+
+def _verify_project(memory, project_id):
+    assert project_id in memory.projects
+    assert project_id in memory.project_memories
+    assert len(memory.project_memories[project_id]) == 1
+    assert memory.project_memories[project_id][0].content == "Persistent memory"
+
+
+class TestMemoryPersistence:
+    """Test persistence of conversation and project memory."""
+    
+    @pytest.mark.parametrize(
+        "factory,write,verify",
+        [
+            pytest.param(_conversation_memory, _write_session, _verify_session, id="session"),
+            pytest.param(_project_memory, _write_project, _verify_project, id="project"),
+        ],
+    )
+    def test_persistence(self, factory, write, verify, temp_storage, mock_bedrock, temp_workspace):
+        """Test data persistence across instances."""
+        # Create first instance and add data
+        key = write(factory(temp_storage, mock_bedrock, temp_workspace))
         
-        assert project.id in memory2.projects
-        assert project.id in memory2.project_memories
-        assert len(memory2.project_memories[project.id]) == 1
-        assert memory2.project_memories[project.id][0].content == "Persistent memory"
+        # Create second instance and verify data is loaded
+        verify(factory(temp_storage, mock_bedrock, temp_workspace), key)
+    
+    def test_persistence_with_non_string_keys_and_big_ints(
+        self, temp_storage, mock_bedrock, temp_workspace
+    ):
+        """Test memories whose metadata plain JSON accepts are still written."""
+        memory = _project_memory(temp_storage, mock_bedrock, temp_workspace)
+        project = memory.create_project("Metadata Project")
+        memory.add_memory("Int keys", project_id=project.id, metadata={1: "x"})
+        memory.add_memory("Big int", project_id=project.id, metadata={"size": 2 ** 70})
+        
+        reloaded = _project_memory(temp_storage, mock_bedrock, temp_workspace)
+        memories = reloaded.project_memories[project.id]
+        assert [m.metadata for m in memories] == [{"1": "x"}, {"size": 2 ** 70}]
+    
+    def test_persistence_with_non_finite_floats(self, temp_storage, mock_bedrock, temp_workspace):
+        """Test NaN/Infinity survive saving and files written by plain json still load."""
+        memory = _project_memory(temp_storage, mock_bedrock, temp_workspace)
+        project = memory.create_project("Float Project")
+        memory.add_memory("Scored", project_id=project.id, metadata={"score": float("nan")})
+        
+        reloaded = _project_memory(temp_storage, mock_bedrock, temp_workspace)
+        assert math.isnan(reloaded.project_memories[project.id][0].metadata["score"])
+        
+        # Rewrite the file the way json.dump always has
+        memories_file = temp_storage / "projects" / f"memories_{project.id}.json"
+        entry = reloaded.project_memories[project.id][0].to_dict()
+        entry["metadata"] = {"score": float("inf")}
+        memories_file.write_text(json.dumps([entry], indent=2), encoding="utf-8")
+        
+        reloaded = _project_memory(temp_storage, mock_bedrock, temp_workspace)
+        assert reloaded.project_memories[project.id][0].metadata == {"score": float("inf")}
 
 
 class TestMemoryProvider:
     """Test the main memory provider."""
     
-    @pytest.fixture
-    def temp_storage(self):
-        """Create temporary storage directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            workspace = Path(temp_dir)
-            (workspace / "README.md").write_text("# Test Project")
-            yield workspace
-    
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_embeddings = AsyncMock(return_value=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
-        return mock
+        """Stub Bedrock client returning two embeddings."""
+        return _StubBedrock([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    
+    @pytest.fixture(scope="class")
+    def memory_provider_factory(self, tmp_path_factory, workspace_template, mock_bedrock):
+        """Build memory providers with fresh storage over the shared workspace."""
+        def make():
+            return MemoryProvider(
+                storage_path=tmp_path_factory.mktemp("provider"),
+                bedrock_client=mock_bedrock,
+                workspace_root=str(workspace_template)
+            )
+        
+        return make
     
     @pytest.fixture
-    def memory_provider(self, temp_storage, temp_workspace, mock_bedrock):
+    def memory_provider(self, memory_provider_factory):
         """Create memory provider instance."""
-        return MemoryProvider(
-            storage_path=temp_storage,
-            bedrock_client=mock_bedrock,
-            workspace_root=str(temp_workspace)
-        )
+        return memory_provider_factory()
     
     def test_create_conversation_with_project(self, memory_provider):
         """Test creating conversation linked to project."""
@@ -337,8 +425,8 @@ class TestMemoryProvider:
         session = memory_provider.create_conversation_session("Test Session")
         
         # Add some data
-        memory_provider.add_conversation_message("Hello", MessageRole.USER)
-        memory_provider.add_conversation_message("Hi there!", MessageRole.ASSISTANT)
+        memory_provider.add_conversation_message("Hello", _USER)
+        memory_provider.add_conversation_message("Hi there!", _ASSISTANT)
         
         # Get full context
         context = memory_provider.get_full_context()
@@ -348,25 +436,24 @@ class TestMemoryProvider:
         assert len(context["conversation"]["messages"]) == 2
         assert context["project"]["project"]["name"] == "Test Project"
     
-    @pytest.mark.asyncio
     async def test_unified_search(self, memory_provider):
         """Test unified search across memory types."""
         # Create project and add memories
         project = memory_provider.create_project("Test Project")
         await memory_provider.add_project_memory(
             "Authentication implementation with JWT tokens",
-            memory_type=MemoryType.PROJECT
+            memory_type=_PROJECT
         )
         
         # Add conversation
         session = memory_provider.create_conversation_session("Auth Discussion")
         memory_provider.add_conversation_message(
             "How do I implement JWT authentication?",
-            MessageRole.USER
+            _USER
         )
         memory_provider.add_conversation_message(
             "You can use the PyJWT library for JWT tokens.",
-            MessageRole.ASSISTANT
+            _ASSISTANT
         )
         
         # Search across all memory types
@@ -379,7 +466,6 @@ class TestMemoryProvider:
         # Should have at least one type of memory
         assert len(memory_types) >= 1
     
-    @pytest.mark.asyncio
     async def test_semantic_search(self, memory_provider):
         """Test semantic search with embeddings."""
         # Create project and add memory with embedding
@@ -399,19 +485,21 @@ class TestMemoryProvider:
         assert results[0].entry.content == "User authentication and authorization system"
         assert results[0].score > 0
     
-    @pytest.mark.asyncio
     async def test_memory_optimization(self, memory_provider):
         """Test memory optimization functionality."""
         # Create project and add many memories
         project = memory_provider.create_project("Test Project")
         
-        # Add memories with different importance levels
-        for i in range(20):
-            importance = 0.1 if i < 10 else 0.9  # Half low, half high importance
-            await memory_provider.add_project_memory(
+        # Add memories with different importance levels, saving once at the end
+        await asyncio.gather(*[
+            memory_provider.add_project_memory(
                 f"Memory {i}",
-                importance=importance
+                importance=0.1 if i < 10 else 0.9,  # Half low, half high importance
+                persist=False
             )
+            for i in range(20)
+        ])
+        memory_provider.flush()
         
         # Optimize memories
         await memory_provider.optimize_memories(
@@ -428,12 +516,76 @@ class TestMemoryProvider:
         for memory in remaining_memories:
             assert memory.importance >= 0.5
     
+    async def test_embedding_cache(self, memory_provider):
+        """Test that repeated texts reuse cached embeddings."""
+        memory_provider.create_project("Test Project")
+        
+        await memory_provider.add_project_memory("JWT authentication")
+        await memory_provider.semantic_search("JWT authentication", similarity_threshold=0.0)
+        
+        assert memory_provider.bedrock.misses == 1
+        assert memory_provider.bedrock.hits == 1
+    
+    async def test_embedding_cache_keeps_positions(self):
+        """Test cached and fresh embeddings line up with their input texts."""
+        cache = CachingBedrock(_StubBedrock([[0.1]]))
+        assert await cache.generate_embeddings(["a"]) == [[0.1]]
+        
+        # "a" is cached; only "b" goes to the inner client
+        cache.inner = _StubBedrock([[0.2]])
+        assert await cache.generate_embeddings(["b", "a"]) == [[0.2], [0.1]]
+        
+        # A short response cannot be aligned with the texts, so it is an error
+        cache.inner = _StubBedrock([])
+        with pytest.raises(BedrockError):
+            await cache.generate_embeddings(["c", "a"])
+    
+    async def test_embedding_cache_skips_empty_vectors(self):
+        """Test failed (empty) embeddings are returned but not cached."""
+        cache = CachingBedrock(_StubBedrock([[]]))
+        assert await cache.generate_embeddings(["a"]) == [[]]
+        
+        cache.inner = _StubBedrock([[0.3]])
+        assert await cache.generate_embeddings(["a"]) == [[0.3]]
+        assert cache.misses == 2
+    
+    async def test_embedding_cache_survives_eviction_while_awaiting(self):
+        """Test hits stay in the result if the cache is cleared mid-request."""
+        cache = CachingBedrock(_StubBedrock([[0.1]]))
+        await cache.generate_embeddings(["a"])
+        
+        release = asyncio.Event()
+        
+        class _GatedBedrock(_StubBedrock):
+            async def generate_embeddings(self, texts):
+                await release.wait()
+                return await super().generate_embeddings(texts)
+        
+        cache.inner = _GatedBedrock([[0.2]])
+        request = asyncio.create_task(cache.generate_embeddings(["b", "a"]))
+        await asyncio.sleep(0)
+        cache.clear_cache()
+        release.set()
+        
+        assert await request == [[0.2], [0.1]]
+    
+    async def test_forced_regeneration_bypasses_embedding_cache(self, memory_provider):
+        """Test force_regenerate fetches new embeddings instead of cached ones."""
+        project = memory_provider.create_project("Test Project")
+        memory = await memory_provider.add_project_memory("hello")
+        assert memory.embedding == [0.1, 0.2, 0.3]
+        
+        memory_provider.bedrock.inner = _StubBedrock([[0.9, 0.8, 0.7]])
+        await memory_provider.regenerate_embeddings(project.id, force_regenerate=True)
+        
+        assert memory.embedding == [0.9, 0.8, 0.7]
+    
     def test_memory_stats(self, memory_provider):
         """Test memory statistics."""
         # Create some data
         project = memory_provider.create_project("Test Project")
         session = memory_provider.create_conversation_session("Test Session")
-        memory_provider.add_conversation_message("Hello", MessageRole.USER)
+        memory_provider.add_conversation_message("Hello", _USER)
         
         stats = memory_provider.get_memory_stats()
         
@@ -444,7 +596,6 @@ class TestMemoryProvider:
         assert stats["project"]["total_projects"] == 1
         assert stats["total_memories"] >= 1
     
-    @pytest.mark.asyncio
     async def test_conversation_to_project_memory(self, memory_provider):
         """Test converting conversation to project memories."""
         # Create project and conversation
@@ -457,15 +608,15 @@ class TestMemoryProvider:
         # Add important conversation
         memory_provider.add_conversation_message(
             "How should we structure the authentication module?",
-            MessageRole.USER
+            _USER
         )
         memory_provider.add_conversation_message(
             "We should use a layered approach with JWT tokens and role-based access control.",
-            MessageRole.ASSISTANT
+            _ASSISTANT
         )
         memory_provider.add_conversation_message(
             "That sounds good. Let's implement it with FastAPI.",
-            MessageRole.USER
+            _USER
         )
         
         # Convert conversation to memories
@@ -494,7 +645,7 @@ class TestMemoryModels:
         """Test conversation message serialization."""
         message = ConversationMessage(
             content="Test message",
-            role=MessageRole.USER,
+            role=_USER,
             metadata={"test": "data"},
             tool_calls=[{"function": {"name": "test_tool"}}]
         )
@@ -529,14 +680,16 @@ class TestMemoryModels:
         assert memory.access_count == 1
         assert memory.last_accessed is not None
         
-        # Mark as accessed again
-        old_access_time = memory.last_accessed
-        import time
-        time.sleep(0.001)  # Small delay to ensure different timestamp
-        memory.mark_accessed()
+        # Mark as accessed again at explicit times
+        first_tick = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        second_tick = datetime(2024, 1, 1, 12, 0, 1, tzinfo=timezone.utc)
+        memory.mark_accessed(now=first_tick)
+        assert memory.last_accessed == first_tick
+        
+        memory.mark_accessed(now=second_tick)
         
-        assert memory.access_count == 2
-        assert memory.last_accessed >= old_access_time
+        assert memory.access_count == 3
+        assert memory.last_accessed == second_tick
     
     def test_conversation_session_title_generation(self):
         """Test automatic title generation for sessions."""
@@ -545,7 +698,7 @@ class TestMemoryModels:
         # Add first user message
         message = ConversationMessage(
             content="How do I implement authentication in my web application?",
-            role=MessageRole.USER
+            role=_USER
         )
         session.add_message(message)
         
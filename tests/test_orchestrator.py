@@ -1,10 +1,9 @@
 """Tests for the agent orchestrator system."""
 
 import asyncio
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+import json
 
+import orjson
 import pytest
 
 from agent.orchestrator.core import AgentOrchestrator, StreamingEvent
@@ -17,6 +16,66 @@ from agent.orchestrator.state import (
     StepType,
 )
 
+# Canned planner responses, serialized once for the whole module
+_TOOL_PLAN_JSON = json.dumps({"plan": [{
+    "description": "Test step",
+    "tool_name": "test_tool",
+    "tool_args": {"arg1": "value1"},
+    "reasoning": "Test reasoning",
+    "expected_outcome": "Test outcome",
+}]})
+
+_REASONING_PLAN_JSON = json.dumps({"plan": [{
+    "description": "Test step",
+    "tool_name": None,
+    "tool_args": {},
+    "reasoning": "Test reasoning",
+    "expected_outcome": "Test outcome",
+}]})
+
+_INTEGRATION_PLAN_JSON = json.dumps({
+    "plan": [
+        {
+            "description": "Read the test file",
+            "tool_name": "read_file",
+            "tool_args": {"file_path": "test.txt"},
+            "reasoning": "Need to read the file content",
+            "expected_outcome": "File content retrieved"
+        },
+        {
+            "description": "List directory contents",
+            "tool_name": "list_dir",
+            "tool_args": {"path": "."},
+            "reasoning": "Need to see what files are available",
+            "expected_outcome": "Directory listing obtained"
+        }
+    ]
+})
+
+
+class FakeBedrock:
+    """Minimal Bedrock stand-in returning a fixed response."""
+    
+    def __init__(self, response: str):
+        self.response = response
+    
+    def set_response(self, response: str):
+        """Replace the response returned by subsequent calls."""
+        self.response = response
+    
+    async def generate_response(self, *args, **kwargs):
+        return self.response
+
+
+@pytest.fixture(scope="session")
+def shared_workspace(tmp_path_factory):
+    """Read-only sample workspace built once per session."""
+    workspace = tmp_path_factory.mktemp("ws")
+    (workspace / "test.txt").write_text("Hello, world!")
+    (workspace / "data").mkdir()
+    (workspace / "data" / "info.json").write_text('{"key": "value"}')
+    return workspace
+
 
 class TestExecutionState:
     """Test execution state management."""
@@ -119,8 +178,8 @@ class TestExecutionState:
         step.complete("Test result")
         state.add_step(step)
         
-        # Serialize
-        data = state.to_dict()
+        # Serialize, round-tripping through JSON to catch non-JSON-safe fields
+        data = orjson.loads(orjson.dumps(state.to_dict()))
         
         # Deserialize
         restored_state = ExecutionState.from_dict(data)
@@ -137,17 +196,14 @@ class TestTaskPlanner:
     
     @pytest.fixture
     def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_response = AsyncMock(return_value='{"plan": [{"description": "Test step", "tool_name": "test_tool", "tool_args": {"arg1": "value1"}, "reasoning": "Test reasoning", "expected_outcome": "Test outcome"}]}')
-        return mock
+        """Stub Bedrock client."""
+        return FakeBedrock(_TOOL_PLAN_JSON)
     
     @pytest.fixture
     def task_planner(self, mock_bedrock):
         """Create task planner instance."""
         return TaskPlanner(bedrock_client=mock_bedrock)
     
-    @pytest.mark.asyncio
     async def test_create_plan(self, task_planner):
         """Test creating execution plan."""
         execution_state = await task_planner.create_plan(
@@ -162,10 +218,9 @@ class TestTaskPlanner:
         assert execution_state.steps[0].tool_name == "test_tool"
         assert execution_state.steps[0].tool_args == {"arg1": "value1"}
     
-    @pytest.mark.asyncio
     async def test_plan_parsing_error(self, mock_bedrock):
         """Test handling of plan parsing errors."""
-        mock_bedrock.generate_response = AsyncMock(return_value="Invalid JSON response")
+        mock_bedrock.set_response("Invalid JSON response")
         
         planner = TaskPlanner(bedrock_client=mock_bedrock)
         
@@ -175,7 +230,6 @@ class TestTaskPlanner:
         assert len(execution_state.steps) == 1
         assert "fallback" in execution_state.steps[0].metadata.get("reasoning", "").lower()
     
-    @pytest.mark.asyncio
     async def test_refine_plan(self, task_planner):
         """Test plan refinement."""
         # Create initial execution state
@@ -199,17 +253,14 @@ class TestTaskExecutor:
     """Test task execution functionality."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
+    def temp_workspace(self, tmp_path_factory):
+        """Create an empty per-test workspace."""
+        return tmp_path_factory.mktemp("case")
     
     @pytest.fixture
     def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_response = AsyncMock(return_value="Reasoning result")
-        return mock
+        """Stub Bedrock client."""
+        return FakeBedrock("Reasoning result")
     
     @pytest.fixture
     def task_executor(self, temp_workspace, mock_bedrock):
@@ -229,7 +280,6 @@ class TestTaskExecutor:
         assert "custom_tool" in task_executor.tools
         assert task_executor.tools["custom_tool"] == custom_tool
     
-    @pytest.mark.asyncio
     async def test_execute_tool_call_step(self, task_executor, temp_workspace):
         """Test executing tool call step."""
         # Create test file
@@ -253,7 +303,6 @@ class TestTaskExecutor:
         assert result_state.steps[0].status == ExecutionStatus.COMPLETED
         assert "Test content" in str(result_state.steps[0].result)
     
-    @pytest.mark.asyncio
     async def test_execute_reasoning_step(self, task_executor):
         """Test executing reasoning step."""
         execution_state = ExecutionState(instruction="Test reasoning")
@@ -269,7 +318,6 @@ class TestTaskExecutor:
         assert result_state.steps[0].status == ExecutionStatus.COMPLETED
         assert result_state.steps[0].result == "Reasoning result"
     
-    @pytest.mark.asyncio
     async def test_execute_with_retries(self, task_executor):
         """Test execution with retry logic."""
         # Mock a tool that fails twice then succeeds
@@ -299,16 +347,20 @@ class TestTaskExecutor:
         assert result_state.steps[0].result == "Success"
         assert call_count == 3
     
-    @pytest.mark.asyncio
-    async def test_execution_callbacks(self, task_executor):
+    @pytest.mark.parametrize("event_kind, expected", [
+        ("started", 1),
+        ("completed", 1),
+        ("failed", 0),
+    ])
+    async def test_execution_callbacks(self, task_executor, event_kind, expected):
         """Test execution callbacks."""
-        started_steps = []
-        completed_steps = []
-        failed_steps = []
+        called_steps = []
         
-        task_executor.add_step_callback("started", lambda step: started_steps.append(step.id))
-        task_executor.add_step_callback("completed", lambda step: completed_steps.append(step.id))
-        task_executor.add_step_callback("failed", lambda step, error: failed_steps.append(step.id))
+        # "failed" callbacks also receive the error, so accept extra args
+        task_executor.add_step_callback(
+            event_kind,
+            lambda step, *args: called_steps.append(step.id)
+        )
         
         execution_state = ExecutionState(instruction="Test callbacks")
         step = ExecutionStep(
@@ -319,13 +371,8 @@ class TestTaskExecutor:
         
         await task_executor.execute(execution_state)
         
-        assert len(started_steps) == 1
-        assert len(completed_steps) == 1
-        assert len(failed_steps) == 0
-        assert started_steps[0] == step.id
-        assert completed_steps[0] == step.id
+        assert called_steps == [step.id] * expected
     
-    @pytest.mark.asyncio
     async def test_pause_resume_execution(self, task_executor):
         """Test pausing and resuming execution."""
         execution_state = ExecutionState(instruction="Test pause/resume")
@@ -348,17 +395,14 @@ class TestAgentOrchestrator:
     """Test main agent orchestrator."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
+    def temp_workspace(self, tmp_path_factory):
+        """Create an empty per-test workspace."""
+        return tmp_path_factory.mktemp("case")
     
     @pytest.fixture
     def mock_bedrock(self):
-        """Mock Bedrock client."""
-        mock = MagicMock()
-        mock.generate_response = AsyncMock(return_value='{"plan": [{"description": "Test step", "tool_name": null, "tool_args": {}, "reasoning": "Test reasoning", "expected_outcome": "Test outcome"}]}')
-        return mock
+        """Stub Bedrock client."""
+        return FakeBedrock(_REASONING_PLAN_JSON)
     
     @pytest.fixture
     def orchestrator(self, temp_workspace, mock_bedrock):
@@ -368,7 +412,6 @@ class TestAgentOrchestrator:
             workspace_root=str(temp_workspace)
         )
     
-    @pytest.mark.asyncio
     async def test_execute_instruction_sync(self, orchestrator):
         """Test synchronous instruction execution."""
         result = await orchestrator.execute_instruction(
@@ -381,22 +424,23 @@ class TestAgentOrchestrator:
         assert result.status == ExecutionStatus.COMPLETED
         assert len(result.steps) >= 1
     
-    @pytest.mark.asyncio
     async def test_execute_instruction_streaming(self, orchestrator):
         """Test streaming instruction execution."""
-        events = []
+        event_types = set()
+        event_count = 0
         
         async for event in orchestrator.execute_instruction(
             instruction="Test instruction",
             streaming=True
         ):
-            events.append(event)
+            event_types.add(event.event_type)
+            event_count += 1
             if event.event_type == "execution_completed":
                 break
         
-        assert len(events) > 0
-        assert any(event.event_type == "planning_started" for event in events)
-        assert any(event.event_type == "execution_completed" for event in events)
+        assert event_count > 0
+        assert "planning_started" in event_types
+        assert "execution_completed" in event_types
     
     def test_streaming_callbacks(self, orchestrator):
         """Test streaming callback system."""
@@ -414,26 +458,32 @@ class TestAgentOrchestrator:
         assert received_events[0].event_type == "test_event"
         assert received_events[0].data == {"test": "data"}
     
-    @pytest.mark.asyncio
     async def test_execution_management(self, orchestrator):
         """Test execution management operations."""
-        # Start execution in background
-        execution_task = asyncio.create_task(
-            orchestrator.execute_instruction("Long running task")
-        )
+        started = asyncio.Event()
         
-        # Give it a moment to start
-        await asyncio.sleep(0.1)
+        def on_event(event: StreamingEvent):
+            if event.event_type == "step_started":
+                started.set()
         
-        # Check active executions
-        active_executions = orchestrator.get_active_executions()
-        assert len(active_executions) >= 0  # May be 0 if execution completed quickly
+        orchestrator.add_streaming_callback(on_event)
         
-        # Wait for completion
-        result = await execution_task
+        # Run execution in the background; the group awaits it on exit
+        async with asyncio.TaskGroup() as task_group:
+            execution_task = task_group.create_task(
+                orchestrator.execute_instruction("Long running task")
+            )
+            
+            # Wait until the first step has started
+            await asyncio.wait_for(started.wait(), timeout=1.0)
+            
+            # Check active executions
+            active_executions = orchestrator.get_active_executions()
+            assert len(active_executions) >= 0  # May be 0 if execution completed quickly
+        
+        result = execution_task.result()
         assert result.status == ExecutionStatus.COMPLETED
     
-    @pytest.mark.asyncio
     async def test_failure_analysis(self, orchestrator):
         """Test failure analysis and replanning."""
         # Create execution state with failed step
@@ -455,45 +505,15 @@ class TestIntegration:
     """Integration tests for the orchestrator system."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            workspace = Path(temp_dir)
-            # Create test files
-            (workspace / "test.txt").write_text("Hello, world!")
-            (workspace / "data").mkdir()
-            (workspace / "data" / "info.json").write_text('{"key": "value"}')
-            yield workspace
+    def temp_workspace(self, shared_workspace):
+        """Provide the shared sample workspace; these tests only read it."""
+        return shared_workspace
     
     @pytest.fixture
     def mock_bedrock(self):
-        """Mock Bedrock client with realistic responses."""
-        mock = MagicMock()
-        
-        # Mock planning response
-        plan_response = {
-            "plan": [
-                {
-                    "description": "Read the test file",
-                    "tool_name": "read_file",
-                    "tool_args": {"file_path": "test.txt"},
-                    "reasoning": "Need to read the file content",
-                    "expected_outcome": "File content retrieved"
-                },
-                {
-                    "description": "List directory contents",
-                    "tool_name": "list_dir",
-                    "tool_args": {"path": "."},
-                    "reasoning": "Need to see what files are available",
-                    "expected_outcome": "Directory listing obtained"
-                }
-            ]
-        }
-        
-        mock.generate_response = AsyncMock(return_value=json.dumps(plan_response))
-        return mock
+        """Stub Bedrock client with realistic responses."""
+        return FakeBedrock(_INTEGRATION_PLAN_JSON)
     
-    @pytest.mark.asyncio
     async def test_end_to_end_execution(self, temp_workspace, mock_bedrock):
         """Test complete end-to-end execution."""
         orchestrator = AgentOrchestrator(
@@ -522,7 +542,6 @@ class TestIntegration:
         list_step = result.steps[1]
         assert "test.txt" in str(list_step.result)
     
-    @pytest.mark.asyncio
     async def test_streaming_execution(self, temp_workspace, mock_bedrock):
         """Test streaming execution with real events."""
         orchestrator = AgentOrchestrator(
@@ -530,15 +549,15 @@ class TestIntegration:
             workspace_root=str(temp_workspace)
         )
         
-        events = []
         event_types = set()
+        event_count = 0
         
         async for event in orchestrator.execute_instruction(
             instruction="Read test file",
             streaming=True
         ):
-            events.append(event)
             event_types.add(event.event_type)
+            event_count += 1
             
             if event.event_type == "execution_completed":
                 break
@@ -553,7 +572,7 @@ class TestIntegration:
         }
         
         assert expected_events.issubset(event_types)
-        assert len(events) >= len(expected_events)
+        assert event_count >= len(expected_events)
 
 
 if __name__ == "__main__":
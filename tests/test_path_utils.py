@@ -9,6 +9,7 @@ from agent.security.exceptions import SecurityError
 from agent.security.path_utils import (
     SecurePath,
     calculate_directory_size,
+    classify_paths,
     find_files_by_pattern,
     get_file_extension,
     get_safe_filename,
@@ -166,6 +167,20 @@ class TestPathUtilities:
         for filename in non_code_files:
             assert is_code_file(Path(filename)) is False
     
+    def test_classify_paths(self):
+        """Test batch text/code classification matches the per-path helpers."""
+        paths = [
+            "src/main.py", "docs/README.md", "Makefile", "image.png",
+            "web/app.TSX", ".hidden", "notes.txt", "lib/util.c",
+        ]
+        
+        text_files, code_files = classify_paths(paths)
+        
+        assert text_files == [p for p in paths if is_text_file(Path(p))]
+        assert code_files == [p for p in paths if is_code_file(Path(p))]
+        assert "src/main.py" in text_files and "src/main.py" in code_files
+        assert "image.png" not in text_files + code_files
+    
     def test_get_safe_filename(self):
         """Test safe filename generation."""
         test_cases = [
@@ -176,6 +191,8 @@ class TestPathUtilities:
             ("", "file_"),
             (".hidden", "file_.hidden"),
             ("file<>|?*.txt", "file_.txt"),
+            ("résumé.pdf", "résumé.pdf"),
+            ("日本語 メモ.txt", "日本語_メモ.txt"),
         ]
         
         for input_name, expected in test_cases: